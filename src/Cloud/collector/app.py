@@ -1,11 +1,22 @@
 # app.py - MQTT Collector für Sensor-Daten mit PostgreSQL
 import paho.mqtt.client as mqtt
 import psycopg2
-import json
-from datetime import datetime
+from psycopg2 import errorcodes
+from psycopg2.extras import execute_batch, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+import orjson
+import ciso8601
+from datetime import datetime, timezone
 import os
 import time
 import sys
+import threading
+import queue
+import io
+import logging
+import signal
+import random
+import weakref
 
 # PostgreSQL-Verbindungsparameter
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "postgres")
@@ -20,6 +31,52 @@ MQTT_PORT = int(os.getenv("MQTT_PORT", "1883"))
 MQTT_USER = os.getenv("MQTT_USER", "bobm")
 MQTT_PASS = os.getenv("MQTT_PASS", "letmein")
 
+# Batch-Parameter (Flush bei BATCH_SIZE Zeilen oder nach FLUSH_MS Millisekunden)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "500"))
+FLUSH_MS = int(os.getenv("FLUSH_MS", "100"))
+
+# Connection-Pool und Schreib-Queue
+POOL_MIN = int(os.getenv("POOL_MIN", "2"))
+POOL_MAX = int(os.getenv("POOL_MAX", "8"))
+QUEUE_SIZE = int(os.getenv("QUEUE_SIZE", "10000"))
+
+# Telemetrie-Commits ohne WAL-fsync (synchronous_commit = off): bei einem
+# Absturz des Datenbank-Servers gehen höchstens die Commits der letzten
+# ~3 x wal_writer_delay (Standard 200 ms) verloren - für abgetastete Sensordaten
+# akzeptabel. Status-Upserts bleiben synchron. TELEMETRY_SYNC_COMMIT=1 schaltet
+# das ab.
+TELEMETRY_SYNC_COMMIT = os.getenv("TELEMETRY_SYNC_COMMIT", "0") == "1"
+
+# Unveränderte Status-Meldungen (Heartbeats) werden gesammelt alle
+# HEARTBEAT_FLUSH_S Sekunden als last_seen-Update geschrieben
+HEARTBEAT_FLUSH_S = int(os.getenv("HEARTBEAT_FLUSH_S", "60"))
+
+# Ab dieser Batch-Größe wird COPY statt INSERT verwendet
+COPY_THRESHOLD = int(os.getenv("COPY_THRESHOLD", "250"))
+
+# Partitionierung (Monats-Partitionen für Zeitreihen-Tabellen)
+PARTITIONED_TABLES = ("temperature", "humidity")
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "1"))
+PARTITION_CHECK_S = 24 * 3600
+
+# UNLOGGED-Staging (optional, USE_STAGING=1): Telemetrie wird ohne WAL in
+# <tabelle>_stage geschrieben und alle STAGE_MOVE_S Sekunden in die
+# partitionierten Tabellen verschoben. Trade-off: UNLOGGED-Tabellen werden nach
+# einem Absturz des Datenbank-Servers geleert, verloren gehen also höchstens die
+# Zeilen der letzten STAGE_MOVE_S Sekunden.
+USE_STAGING = os.getenv("USE_STAGING", "0") == "1"
+STAGE_MOVE_S = int(os.getenv("STAGE_MOVE_S", "10"))
+WRITE_TABLES = {table: f"{table}_stage" if USE_STAGING else table for table in PARTITIONED_TABLES}
+
+# Logging (Details pro Nachricht nur mit LOG_LEVEL=DEBUG, sonst eine Zusammenfassung
+# alle LOG_EVERY Nachrichten)
+LOG_EVERY = int(os.getenv("LOG_EVERY", "1000"))
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "WARNING"),
+    format="%(asctime)s %(levelname)s %(message)s"
+)
+log = logging.getLogger("collector")
+
 print("="*60)
 print("MQTT to PostgreSQL Collector")
 print("="*60)
@@ -34,7 +91,9 @@ retry_count = 0
 
 while retry_count < max_retries:
     try:
-        conn = psycopg2.connect(
+        pool = ThreadedConnectionPool(
+            POOL_MIN,
+            POOL_MAX,
             host=POSTGRES_HOST,
             port=POSTGRES_PORT,
             database=POSTGRES_DB,
@@ -46,65 +105,408 @@ while retry_count < max_retries:
     except psycopg2.OperationalError as e:
         retry_count += 1
         print(f"Versuch {retry_count}/{max_retries} - PostgreSQL noch nicht bereit...")
-        time.sleep(2)
+        # Exponentielles Backoff mit Jitter (max. 60s)
+        time.sleep(min(60, 2 ** retry_count) * random.uniform(0.5, 1.5))
 
 if retry_count >= max_retries:
     print("PostgreSQL-Verbindung fehlgeschlagen!")
     sys.exit(1)
 
+def rollback_quietly(conn):
+    """Rollback nach einem Fehler. Ist die Verbindung abgebrochen (z.B. Neustart
+    von Postgres oder pgbouncer), schlägt auch das Rollback fehl - das wird ignoriert"""
+    try:
+        conn.rollback()
+    except psycopg2.Error:
+        pass
+
+def release_conn(conn):
+    """Gibt eine Verbindung an den Pool zurück. Abgebrochene Verbindungen werden
+    geschlossen, damit der Pool beim nächsten getconn eine neue öffnet"""
+    pool.putconn(conn, close=bool(conn.closed))
+
+def ensure_partitions(cursor):
+    """Legt die Monats-Partitionen für den aktuellen und die nächsten Monate an"""
+    today = datetime.utcnow()
+    year, month = today.year, today.month
+
+    for _ in range(PARTITION_MONTHS_AHEAD + 1):
+        for table in PARTITIONED_TABLES:
+            create_month_partition(cursor, table, year, month)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def create_month_partition(cursor, table, year, month):
+    """Legt die Partition einer Tabelle für einen Monat an (falls noch nicht vorhanden)"""
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table}_{year:04d}_{month:02d}
+        PARTITION OF {table}
+        FOR VALUES FROM ('{year:04d}-{month:02d}-01 00:00+00')
+        TO ('{next_year:04d}-{next_month:02d}-01 00:00+00');
+    """)
+
+def partition_maintenance():
+    """Prüft täglich, ob die Partitionen für die kommenden Monate existieren"""
+    while True:
+        time.sleep(PARTITION_CHECK_S)
+        try:
+            conn = pool.getconn()
+        except psycopg2.Error as e:
+            log.error("Keine Datenbank-Verbindung für Partitions-Wartung: %s", e)
+            continue
+        try:
+            with conn.cursor() as cursor:
+                ensure_partitions(cursor)
+            conn.commit()
+        except Exception as e:
+            log.error("Fehler bei Partitions-Wartung: %s", e)
+            rollback_quietly(conn)
+        finally:
+            release_conn(conn)
+
+def move_staged():
+    """Verschiebt die Zeilen aus den Staging-Tabellen in einer Transaktion
+    in die partitionierten Tabellen"""
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            for table in PARTITIONED_TABLES:
+                cursor.execute(f"""
+                    WITH d AS (DELETE FROM {table}_stage RETURNING *)
+                    INSERT INTO {table} (device_id, value, unit, timestamp, created_at)
+                    SELECT device_id, value, unit, timestamp, created_at FROM d;
+                """)
+        conn.commit()
+    except Exception as e:
+        log.error("Fehler beim Verschieben der Staging-Daten: %s", e)
+        rollback_quietly(conn)
+    finally:
+        release_conn(conn)
+
+def staging_mover():
+    """Verschiebt die Staging-Daten alle STAGE_MOVE_S Sekunden"""
+    while not shutdown_event.wait(timeout=STAGE_MOVE_S):
+        try:
+            move_staged()
+        except Exception as e:
+            # z.B. getconn bei nicht erreichbarer Datenbank - Thread läuft weiter
+            log.error("Staging-Daten nicht verschoben: %s", e)
+
+def migrate_v0_rows(cursor, table):
+    """Übernimmt die Zeilen aus der umbenannten, nicht partitionierten Tabelle
+    der Version 0 (<tabelle>_v0) und löscht sie danach. Vorher werden die
+    Monats-Partitionen für alle Monate mit Daten angelegt - Zeilen in der
+    DEFAULT-Partition würden das spätere Anlegen dieser Partitionen verhindern"""
+    cursor.execute(f"""
+        SELECT DISTINCT date_trunc('month', timestamp AT TIME ZONE 'UTC')
+        FROM {table}_v0;
+    """)
+    for (month_start,) in cursor.fetchall():
+        create_month_partition(cursor, table, month_start.year, month_start.month)
+
+    cursor.execute(f"""
+        INSERT INTO {table} (device_id, value, unit, timestamp, created_at)
+        SELECT device_id, value, unit, timestamp, created_at FROM {table}_v0;
+    """)
+    print(f"  {table}: {cursor.rowcount} Zeilen aus Version 0 migriert")
+    cursor.execute(f"DROP TABLE {table}_v0;")
+
+# Schema-Version: DDL läuft nur, wenn die Datenbank älter als der Code ist,
+# normale Neustarts überspringen den CREATE-Block komplett
+CURRENT_SCHEMA_VERSION = 2
+
+def create_schema(cursor):
+    """Legt Tabellen und Indizes an und setzt die Schema-Version"""
+    # Tabellen erstellen (optimiert für Zeitreihen)
+    # temperature/humidity sind nach timestamp partitioniert: Zeitbereichs-Abfragen
+    # treffen nur die passende Monats-Partition, Aufräumen alter Daten ist ein
+    # DROP TABLE <tabelle>_YYYY_MM statt DELETE. Nicht partitionierte Tabellen
+    # aus Version 0 werden umbenannt und nach dem Anlegen übernommen.
+    # Kein Surrogat-Primärschlüssel: die id wurde nie abgefragt und kostete pro
+    # Zeile einen B-Tree-Eintrag und einen Sequenz-Aufruf.
+    legacy_tables = []
+    for table in PARTITIONED_TABLES:
+        # relkind 'r' = normale Tabelle (Version 0), 'p' = partitioniert
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s);", (table,))
+        row = cursor.fetchone()
+        if row and row[0] == "r":
+            print(f"  {table}: nicht partitionierte Tabelle gefunden, migriere...")
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_v0;")
+            legacy_tables.append(table)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS temperature (
+        device_id TEXT NOT NULL,
+        value REAL NOT NULL,
+        unit TEXT DEFAULT '°C',
+        timestamp TIMESTAMPTZ NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT NOW()
+    ) PARTITION BY RANGE (timestamp);
+    """)
+
+    # Auffang-Partition für Zeitstempel außerhalb der Monats-Partitionen
+    # (z.B. Geräte ohne NTP-Zeit)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS temperature_default PARTITION OF temperature DEFAULT;
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS humidity (
+        device_id TEXT NOT NULL,
+        value REAL NOT NULL,
+        unit TEXT DEFAULT '%',
+        timestamp TIMESTAMPTZ NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT NOW()
+    ) PARTITION BY RANGE (timestamp);
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS humidity_default PARTITION OF humidity DEFAULT;
+    """)
+
+    # Daten aus Version 0 in die partitionierten Tabellen übernehmen
+    for table in legacy_tables:
+        migrate_v0_rows(cursor, table)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sensor_status (
+        device_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        last_seen TIMESTAMPTZ NOT NULL,
+        updated_at TIMESTAMPTZ DEFAULT NOW()
+    );
+    """)
+
+    # Indizes für bessere Performance (auf der Haupttabelle, gilt für alle Partitionen)
+    # Die Daten kommen in Zeitstempel-Reihenfolge an, daher reicht ein BRIN-Index
+    # (Min/Max je 128 Seiten) für Zeitbereichs-Abfragen - um Größenordnungen
+    # kleiner als ein B-Tree. Die Dashboard-Abfragen filtern nur nach Zeit, der
+    # B-Tree auf (device_id, timestamp) wird daher nicht mehr benötigt.
+    for table in PARTITIONED_TABLES:
+        cursor.execute(f"""
+        DROP INDEX IF EXISTS idx_{table}_device_time;
+        """)
+
+        # Migration von Version 1 (id SERIAL, PRIMARY KEY (id, timestamp))
+        cursor.execute(f"""
+        ALTER TABLE {table} DROP COLUMN IF EXISTS id;
+        """)
+        cursor.execute(f"""
+        ALTER TABLE IF EXISTS {table}_stage DROP COLUMN IF EXISTS id;
+        """)
+
+        cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS brin_{table}_ts
+        ON {table} USING BRIN (timestamp) WITH (pages_per_range = 128);
+        """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        v INT PRIMARY KEY
+    );
+    """)
+    cursor.execute("INSERT INTO schema_version (v) VALUES (%s);", (CURRENT_SCHEMA_VERSION,))
+
+conn = pool.getconn()
 cursor = conn.cursor()
 
-# Tabellen erstellen (optimiert für Zeitreihen)
-print("\n[2/3] Erstelle Datenbank-Schema...")
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS temperature (
-    id SERIAL PRIMARY KEY,
-    device_id TEXT NOT NULL,
-    value REAL NOT NULL,
-    unit TEXT DEFAULT '°C',
-    timestamp TIMESTAMPTZ NOT NULL,
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
-""")
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS humidity (
-    id SERIAL PRIMARY KEY,
-    device_id TEXT NOT NULL,
-    value REAL NOT NULL,
-    unit TEXT DEFAULT '%',
-    timestamp TIMESTAMPTZ NOT NULL,
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
-""")
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS sensor_status (
-    device_id TEXT PRIMARY KEY,
-    status TEXT NOT NULL,
-    last_seen TIMESTAMPTZ NOT NULL,
-    updated_at TIMESTAMPTZ DEFAULT NOW()
-);
-""")
-
-# Indizes für bessere Performance
-cursor.execute("""
-CREATE INDEX IF NOT EXISTS idx_temperature_device_time 
-ON temperature(device_id, timestamp DESC);
-""")
-
-cursor.execute("""
-CREATE INDEX IF NOT EXISTS idx_humidity_device_time 
-ON humidity(device_id, timestamp DESC);
-""")
+print("\n[2/3] Prüfe Datenbank-Schema...")
+
+cursor.execute("SELECT to_regclass('public.schema_version') IS NOT NULL;")
+if cursor.fetchone()[0]:
+    cursor.execute("SELECT COALESCE(MAX(v), 0) FROM schema_version;")
+    schema_version = cursor.fetchone()[0]
+else:
+    schema_version = 0
+
+if schema_version < CURRENT_SCHEMA_VERSION:
+    print(f"Erstelle Datenbank-Schema (Version {schema_version} -> {CURRENT_SCHEMA_VERSION})...")
+    create_schema(cursor)
+else:
+    print(f"Datenbank-Schema aktuell (Version {schema_version})")
+
+# Partitionen für aktuellen/nächsten Monat bei jedem Start sicherstellen
+ensure_partitions(cursor)
+
+if USE_STAGING:
+    for table in PARTITIONED_TABLES:
+        cursor.execute(f"""
+        CREATE UNLOGGED TABLE IF NOT EXISTS {table}_stage
+        (LIKE {table} INCLUDING DEFAULTS);
+        """)
 
 conn.commit()
+cursor.close()
+pool.putconn(conn)
 print("Datenbank-Schema bereit!")
 
 # Status-Tracking
 sensor_status = {}
 message_count = 0
+summary_time = time.monotonic()
+summary_count = 0
+
+# Schreib-Queue (on_message legt nur ab, der Writer-Thread schreibt in die DB)
+write_queue = queue.Queue(maxsize=QUEUE_SIZE)
+dropped_count = 0
+shutdown_event = threading.Event()
+
+def enqueue(table, row):
+    """Legt eine Zeile in die Schreib-Queue, bei Überlauf wird die älteste verworfen"""
+    global dropped_count
+    while True:
+        try:
+            write_queue.put_nowait((table, row))
+            return
+        except queue.Full:
+            try:
+                write_queue.get_nowait()
+                dropped_count += 1
+                if dropped_count % 1000 == 1:
+                    log.warning("Schreib-Queue voll - %d Zeilen verworfen", dropped_count)
+            except queue.Empty:
+                pass
+
+def copy_text(value):
+    """Maskiert einen Wert für das Text-Format von COPY (None wird zu NULL)"""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+# Prepared Statements (einmal je Verbindung geparst und geplant)
+PREPARED_STATEMENTS = (
+    f"""
+    PREPARE ins_temperature (text, real, text, timestamptz) AS
+    INSERT INTO {WRITE_TABLES["temperature"]} (device_id, value, unit, timestamp)
+    VALUES ($1, $2, $3, $4);
+    """,
+    f"""
+    PREPARE ins_humidity (text, real, text, timestamptz) AS
+    INSERT INTO {WRITE_TABLES["humidity"]} (device_id, value, unit, timestamp)
+    VALUES ($1, $2, $3, $4);
+    """,
+    """
+    PREPARE ups_status (text, text, timestamptz) AS
+    INSERT INTO sensor_status (device_id, status, last_seen, updated_at)
+    VALUES ($1, $2, $3, NOW())
+    ON CONFLICT (device_id)
+    DO UPDATE SET
+        status = EXCLUDED.status,
+        last_seen = EXCLUDED.last_seen,
+        updated_at = NOW();
+    """,
+)
+# Verbindungsobjekte statt id(conn): der Pool ersetzt geschlossene Verbindungen,
+# eine neue Verbindung kann dabei die Adresse (id) der alten bekommen
+prepared_conns = weakref.WeakSet()
+
+def prepare_statements(conn):
+    """Legt die Prepared Statements auf einer Pool-Verbindung an (nur beim ersten Mal)"""
+    if conn in prepared_conns:
+        return
+
+    with conn.cursor() as cursor:
+        for statement in PREPARED_STATEMENTS:
+            cursor.execute(statement)
+    conn.commit()
+    prepared_conns.add(conn)
+
+def insert_rows(cursor, table, rows):
+    """Schreibt Messwerte in eine Zeitreihen-Tabelle. Kleine Batches per
+    EXECUTE des Prepared Statements, große per COPY FROM STDIN"""
+    if len(rows) < COPY_THRESHOLD:
+        execute_batch(cursor, f"EXECUTE ins_{table} (%s, %s, %s, %s);",
+                      rows, page_size=BATCH_SIZE)
+        return
+
+    buf = io.StringIO()
+    for device_id, value, unit, timestamp in rows:
+        buf.write(f"{copy_text(device_id)}\t{value}\t{copy_text(unit)}\t{timestamp.isoformat()}\n")
+    buf.seek(0)
+    cursor.copy_expert(
+        f"COPY {WRITE_TABLES[table]} (device_id, value, unit, timestamp) FROM STDIN WITH (FORMAT text)",
+        buf
+    )
+
+def write_batch(temp_rows, hum_rows, status_rows):
+    """Schreibt einen Batch über eine Pool-Verbindung: Telemetrie in einem
+    Commit, Status-Upserts in einem zweiten (immer synchronen) Commit"""
+    conn = pool.getconn()
+    try:
+        prepare_statements(conn)
+
+        with conn.cursor() as cursor:
+            if temp_rows or hum_rows:
+                if not TELEMETRY_SYNC_COMMIT:
+                    cursor.execute("SET LOCAL synchronous_commit = off;")
+
+                if temp_rows:
+                    insert_rows(cursor, "temperature", temp_rows)
+
+                if hum_rows:
+                    insert_rows(cursor, "humidity", hum_rows)
+
+                conn.commit()
+
+            if status_rows:
+                execute_batch(cursor, "EXECUTE ups_status (%s, %s, %s);",
+                              status_rows, page_size=BATCH_SIZE)
+                conn.commit()
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Batch gespeichert: %d Temperatur, %d Luftfeuchtigkeit, %d Status",
+                      len(temp_rows), len(hum_rows), len(status_rows))
+    except Exception as e:
+        log.error("Fehler beim Batch-Schreiben: %s", e)
+        # Prepared Statements fehlen auf dieser Verbindung - beim nächsten Mal neu anlegen
+        if getattr(e, "pgcode", None) == errorcodes.INVALID_SQL_STATEMENT_NAME:
+            prepared_conns.discard(conn)
+        # Rollback bei Fehler
+        rollback_quietly(conn)
+    finally:
+        release_conn(conn)
+
+def writer_loop():
+    """Holt Zeilen aus der Queue, gruppiert sie je Tabelle und schreibt sie
+    bei BATCH_SIZE Zeilen oder spätestens nach FLUSH_MS Millisekunden.
+    Nach shutdown_event wird die Queue noch geleert, dann endet der Thread"""
+    temp_rows = []
+    hum_rows = []
+    status_rows = {}  # device_id -> Zeile, nur der letzte Status pro Gerät zählt
+    count = 0
+    deadline = time.monotonic() + FLUSH_MS / 1000
+
+    while True:
+        try:
+            table, row = write_queue.get(timeout=max(0, deadline - time.monotonic()))
+            if table == "sensor_status":
+                status_rows[row[0]] = row
+            elif table == "temperature":
+                temp_rows.append(row)
+            else:
+                hum_rows.append(row)
+            count += 1
+
+            if count < BATCH_SIZE and time.monotonic() < deadline:
+                continue
+        except queue.Empty:
+            pass
+
+        if count:
+            try:
+                write_batch(temp_rows, hum_rows, list(status_rows.values()))
+            except Exception as e:
+                # z.B. getconn bei nicht erreichbarer Datenbank - Batch verwerfen,
+                # der Writer-Thread muss weiterlaufen
+                log.error("Batch verworfen (%d Zeilen): %s", count, e)
+            temp_rows = []
+            hum_rows = []
+            status_rows = {}
+            count = 0
+        if shutdown_event.is_set() and write_queue.empty():
+            return
+        deadline = time.monotonic() + FLUSH_MS / 1000
 
 # MQTT Callbacks
 def on_connect(client, userdata, flags, reason_code, properties):
@@ -122,88 +524,165 @@ def on_connect(client, userdata, flags, reason_code, properties):
     else:
         print(f"MQTT-Verbindungsfehler: {mqtt.connack_string(reason_code)}")
 
+# Heartbeats (Status unverändert): device_id -> (status, letzter last_seen)
+pending_heartbeats = {}
+heartbeat_lock = threading.Lock()
+
+def flush_heartbeats():
+    """Schreibt die gesammelten last_seen-Werte als ein Upsert. Fehlt die Zeile
+    (z.B. weil der Batch mit dem ersten Status verworfen wurde), wird sie mit
+    dem zuletzt empfangenen Status angelegt"""
+    global pending_heartbeats
+    with heartbeat_lock:
+        rows = [(device_id, status, last_seen)
+                for device_id, (status, last_seen) in pending_heartbeats.items()]
+        pending_heartbeats = {}
+    if not rows:
+        return
+
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            execute_values(cursor, """
+                INSERT INTO sensor_status AS s (device_id, status, last_seen, updated_at)
+                VALUES %s
+                ON CONFLICT (device_id)
+                DO UPDATE SET
+                    status = EXCLUDED.status,
+                    last_seen = GREATEST(s.last_seen, EXCLUDED.last_seen),
+                    updated_at = NOW();
+            """, rows, template="(%s, %s, %s, NOW())", page_size=BATCH_SIZE)
+        conn.commit()
+    except Exception as e:
+        log.error("Fehler beim Schreiben der Heartbeats: %s", e)
+        rollback_quietly(conn)
+    finally:
+        release_conn(conn)
+
+def heartbeat_loop():
+    """Schreibt die gesammelten Heartbeats alle HEARTBEAT_FLUSH_S Sekunden"""
+    while not shutdown_event.wait(timeout=HEARTBEAT_FLUSH_S):
+        try:
+            flush_heartbeats()
+        except Exception as e:
+            # z.B. getconn bei nicht erreichbarer Datenbank - Thread läuft weiter
+            log.error("Heartbeats nicht geschrieben: %s", e)
+
+# Nachrichten-Handler je Topic-Typ
+def handle_status(payload, device_id, timestamp, timestamp_str):
+    """STATUS-Nachrichten verarbeiten"""
+    status = payload.get("status", "unknown")
+    previous = sensor_status.get(device_id)
+    
+    sensor_status[device_id] = {
+        "status": status,
+        "last_seen": timestamp_str
+    }
+    
+    # Status unverändert - nur last_seen merken, wird gesammelt geschrieben
+    if previous is not None and previous["status"] == status:
+        with heartbeat_lock:
+            pending_heartbeats[device_id] = (status, timestamp)
+        return
+    
+    with heartbeat_lock:
+        pending_heartbeats.pop(device_id, None)
+    enqueue("sensor_status", (device_id, status, timestamp))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Status gepuffert: %s = %s", device_id, status)
+
+def handle_temperature(payload, device_id, timestamp, timestamp_str):
+    """TEMPERATUR-Daten verarbeiten"""
+    value = float(payload.get("value", 0))
+    unit = payload.get("unit", "°C")
+    
+    enqueue("temperature", (device_id, value, unit, timestamp))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Temperatur gepuffert: %s = %s%s", device_id, value, unit)
+
+def handle_humidity(payload, device_id, timestamp, timestamp_str):
+    """LUFTFEUCHTIGKEIT-Daten verarbeiten"""
+    value = float(payload.get("value", 0))
+    unit = payload.get("unit", "%")
+    
+    enqueue("humidity", (device_id, value, unit, timestamp))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Luftfeuchtigkeit gepuffert: %s = %s%s", device_id, value, unit)
+
+def handle_telemetry(payload, device_id, timestamp, timestamp_str):
+    """Kombinierte Telemetrie (Temperatur und Luftfeuchtigkeit in einer Nachricht) verarbeiten"""
+    if "temperature" in payload:
+        enqueue("temperature", (device_id, float(payload["temperature"]), "°C", timestamp))
+    if "humidity" in payload:
+        enqueue("humidity", (device_id, float(payload["humidity"]), "%", timestamp))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Telemetrie gepuffert: %s = %s°C, %s%%", device_id,
+                  payload.get("temperature"), payload.get("humidity"))
+
+# "temperatur" ist das Topic laut docs/conventions.md und settings.toml
+HANDLERS = {
+    "status": handle_status,
+    "temperature": handle_temperature,
+    "temperatur": handle_temperature,
+    "humidity": handle_humidity,
+    "telemetry": handle_telemetry,
+}
+
+def log_summary():
+    """Gibt eine Zusammenfassung (Rate, Queue-Länge) der letzten LOG_EVERY Nachrichten aus"""
+    global summary_time, summary_count
+    now = time.monotonic()
+    rate = (message_count - summary_count) / max(now - summary_time, 1e-6)
+    log.info("%d Nachrichten empfangen, %.1f msg/s, Queue: %d, verworfen: %d",
+             message_count, rate, write_queue.qsize(), dropped_count)
+    summary_time = now
+    summary_count = message_count
+
 def on_message(client, userdata, msg):
     """Wird aufgerufen wenn MQTT-Nachricht empfangen wird"""
     global message_count
     message_count += 1
+    if message_count % LOG_EVERY == 0:
+        log_summary()
     
     try:
         # Payload parsen
-        payload = json.loads(msg.payload.decode())
+        payload = orjson.loads(msg.payload)
         topic = msg.topic
         
-        print(f"\n[{message_count}] Topic: {topic}")
-        print(f" Payload: {payload}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[%d] Topic: %s Payload: %s", message_count, topic, payload)
         
         # Device-ID extrahieren
         device_id = payload.get("device_id", "unknown")
+        # Ungültige device_id (z.B. null) würde NOT NULL verletzen und den
+        # ganzen Batch aller Geräte zurückrollen - nur diese Nachricht verwerfen
+        if not isinstance(device_id, str) or not device_id:
+            log.warning("Ungültige device_id %r in %s - Nachricht verworfen", device_id, msg.topic)
+            return
         timestamp_str = payload.get("timestamp")
         
         # Timestamp konvertieren
-        if timestamp_str:
-            # ISO8601 Format parsen
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        if isinstance(timestamp_str, str):
+            # ISO8601 Format parsen (C-Parser, versteht auch "Z")
+            timestamp = ciso8601.parse_datetime(timestamp_str)
+        elif timestamp_str:
+            # Unix-Timestamp (Status-Nachrichten laut conventions.md)
+            timestamp = datetime.fromtimestamp(timestamp_str, timezone.utc)
         else:
             timestamp = datetime.utcnow()
         
-        # STATUS-Nachrichten verarbeiten
-        if "status" in topic.lower():
-            status = payload.get("status", "unknown")
-            
-            sensor_status[device_id] = {
-                "status": status,
-                "last_seen": timestamp_str
-            }
-            
-            cursor.execute("""
-                INSERT INTO sensor_status (device_id, status, last_seen, updated_at)
-                VALUES (%s, %s, %s, NOW())
-                ON CONFLICT (device_id) 
-                DO UPDATE SET 
-                    status = EXCLUDED.status,
-                    last_seen = EXCLUDED.last_seen,
-                    updated_at = NOW();
-            """, (device_id, status, timestamp))
-            
-            conn.commit()
-            print(f" Status gespeichert: {device_id} = {status}")
-            return
-        
-        # TEMPERATUR-Daten verarbeiten
-        if "temperature" in topic.lower():
-            value = float(payload.get("value", 0))
-            unit = payload.get("unit", "°C")
-            
-            cursor.execute("""
-                INSERT INTO temperature (device_id, value, unit, timestamp)
-                VALUES (%s, %s, %s, %s);
-            """, (device_id, value, unit, timestamp))
-            
-            conn.commit()
-            print(f"Temperatur gespeichert: {device_id} = {value}{unit}")
-        
-        # LUFTFEUCHTIGKEIT-Daten verarbeiten
-        elif "humidity" in topic.lower():
-            value = float(payload.get("value", 0))
-            unit = payload.get("unit", "%")
-            
-            cursor.execute("""
-                INSERT INTO humidity (device_id, value, unit, timestamp)
-                VALUES (%s, %s, %s, %s);
-            """, (device_id, value, unit, timestamp))
-            
-            conn.commit()
-            print(f" Luftfeuchtigkeit gespeichert: {device_id} = {value}{unit}")
-        
+        # Nach letztem Topic-Segment verteilen (z.B. iiot/.../sensor/temperature)
+        handler = HANDLERS.get(topic.rsplit("/", 1)[-1])
+        if handler:
+            handler(payload, device_id, timestamp, timestamp_str)
         else:
-            print(f" Unbekannter Topic-Typ: {topic}")
+            log.warning("Unbekannter Topic-Typ: %s", topic)
     
-    except json.JSONDecodeError as e:
-        print(f" JSON-Fehler: {e}")
+    except orjson.JSONDecodeError as e:
+        log.warning("JSON-Fehler: %s", e)
     except Exception as e:
-        print(f"  Verarbeitungsfehler: {e}")
-        # Rollback bei Fehler
-        conn.rollback()
+        log.error("Verarbeitungsfehler: %s", e)
 
 def on_disconnect(client, userdata, flags, reason_code, properties):
     """Wird aufgerufen wenn MQTT-Verbindung getrennt wird"""
@@ -237,22 +716,70 @@ client.username_pw_set(MQTT_USER, MQTT_PASS)
 # Keepalive und Reconnect-Einstellungen
 client.reconnect_delay_set(min_delay=1, max_delay=120)
 
+# Der Speicher für eingehende Nachrichten ist über write_queue (QUEUE_SIZE)
+# begrenzt - paho puffert empfangene Nachrichten nicht zwischen
+
+# Writer-Thread für die Datenbank-Schreibzugriffe
+writer_thread = threading.Thread(target=writer_loop, daemon=True)
+writer_thread.start()
+
+# Hintergrund-Thread für das Anlegen neuer Monats-Partitionen
+threading.Thread(target=partition_maintenance, daemon=True).start()
+
+# Hintergrund-Thread für die gesammelten Heartbeats
+threading.Thread(target=heartbeat_loop, daemon=True).start()
+
+# Hintergrund-Thread für das Verschieben der Staging-Daten
+if USE_STAGING:
+    threading.Thread(target=staging_mover, daemon=True).start()
+
+def request_shutdown(signum, frame):
+    """Signal-Handler (z.B. SIGTERM bei docker stop)"""
+    shutdown_event.set()
+
+signal.signal(signal.SIGTERM, request_shutdown)
+
+def shutdown():
+    """Fährt sauber herunter: MQTT stoppen, Schreib-Queue leeren, Verbindungen schließen"""
+    shutdown_event.set()
+    client.loop_stop()
+    client.disconnect()
+    writer_thread.join(timeout=10)
+    # Letzte Flushes dürfen das Herunterfahren nicht abbrechen (z.B. Datenbank
+    # oder pgbouncer beim SIGTERM nicht erreichbar)
+    try:
+        flush_heartbeats()
+    except Exception as e:
+        log.error("Heartbeats beim Herunterfahren nicht geschrieben: %s", e)
+    if USE_STAGING:
+        try:
+            move_staged()
+        except Exception as e:
+            log.error("Staging-Daten beim Herunterfahren nicht verschoben: %s", e)
+    pool.closeall()
+    print(" Verbindungen geschlossen")
+
 try:
     # Verbindung herstellen
     print(f"Verbinde zu {MQTT_HOST}:{MQTT_PORT}...")
     client.connect(MQTT_HOST, MQTT_PORT, keepalive=60)
     
-    # Event-Loop starten (blockierend)
-    client.loop_forever(retry_first_connection=True)
+    # Netzwerk-Loop im Hintergrund-Thread starten (entkoppelt von DB-Schreibzugriffen)
+    client.loop_start()
+    while not shutdown_event.wait(timeout=1):
+        # Ohne Writer-Thread gingen alle Daten verloren - beenden, damit
+        # Docker den Collector neu startet
+        if not writer_thread.is_alive():
+            log.critical("Writer-Thread beendet - Collector wird neu gestartet")
+            sys.exit(1)
+    print("\n\n Programm wird beendet")
 
 except KeyboardInterrupt:
     print("\n\n Programm durch Benutzer beendet")
-    client.disconnect()
-    cursor.close()
-    conn.close()
-    print(" Verbindungen geschlossen")
-    sys.exit(0)
 
 except Exception as e:
     print(f"\n Fataler Fehler: {e}")
-    sys.exit(1)
\ No newline at end of file
+    sys.exit(1)
+
+shutdown()
+sys.exit(0)
@@ -28,9 +28,98 @@ import adafruit_minimqtt.adafruit_minimqtt as MQTT
 import socketpool
 import adafruit_ntp
 import rtc
+import array
+import random
+
+# PIO ist nur auf dem RP2040 verfügbar - sonst wird adafruit_dht verwendet
+try:
+    import rp2pio
+    import adafruit_pioasm
+except ImportError:
+    rp2pio = None
+
+
+# GPIO-Pins des Pico einmalig beim Import auflösen (Pin-Nummer -> board-Pin)
+PICO_PINS = {i: getattr(board, f"GP{i}") for i in range(29) if hasattr(board, f"GP{i}")}
+
+# PIO-Programm für den DHT11 (bei 1 MHz entspricht ein Takt 1 µs):
+# Startsignal (x * 32 µs low), dann je Bit auf die steigende Flanke warten,
+# nach 40 µs abtasten (0-Bit ist nach ~27 µs schon wieder low, 1-Bit erst nach ~70 µs)
+DHT_PIO_PROGRAM = adafruit_pioasm.assemble("""
+.program dht
+    pull block
+    mov x, osr
+    set pins, 0
+    set pindirs, 1
+start_low:
+    jmp x-- start_low [31]
+    set pindirs, 0
+    wait 1 pin 0
+    wait 0 pin 0
+    wait 1 pin 0
+    wait 0 pin 0
+bit_loop:
+    wait 1 pin 0
+    nop [31]
+    nop [7]
+    in pins, 1
+    wait 0 pin 0
+    jmp bit_loop
+""") if rp2pio else None
+
+
+# Debug-Ausgaben im Request-Pfad (UART-Ausgabe blockiert pro Request merklich)
+DEBUG = False
+
+# Vorkodierte HTTP-Bausteine für WebServer._http_response
+_STATUS_LINES = {
+    200: b"HTTP/1.1 200 OK\r\n",
+    400: b"HTTP/1.1 400 Bad Request\r\n",
+    404: b"HTTP/1.1 404 Not Found\r\n",
+    405: b"HTTP/1.1 405 Method Not Allowed\r\n",
+    413: b"HTTP/1.1 413 Payload Too Large\r\n",
+    431: b"HTTP/1.1 431 Request Header Fields Too Large\r\n",
+    500: b"HTTP/1.1 500 Internal Server Error\r\n"
+}
+_CONTENT_TYPES = {
+    "application/json": b"Content-Type: application/json\r\n",
+    "text/plain": b"Content-Type: text/plain\r\n"
+}
+_CONTENT_LENGTH = b"Content-Length: "
+_CRLF = b"\r\n"
+_CONN_CLOSE = b"Connection: close\r\n"
+_CONN_KEEP_ALIVE = b"Connection: keep-alive\r\nKeep-Alive: timeout=5\r\n"
+_SERVER_LINE = b"Server: Pico-W/CircuitPython\r\n"
+_CL_HEADER = b"\r\ncontent-length:"  # Suchmuster im kleingeschriebenen Header-Block
+_CONN_CLOSE_HEADER = b"\r\nconnection: close"
+
+# Platzhalter für uptime_seconds im gecachten /status-Body (feste Breite, mit Leerzeichen aufgefüllt)
+_UPTIME_PREFIX = b'{"uptime_seconds":'
+_UPTIME_WIDTH = 10
+
+# Keep-Alive-Grenzen für WebServer (Verbindungen, Requests pro Verbindung, Leerlauf in s)
+_MAX_ACTIVE_CLIENTS = 2
+_KEEP_ALIVE_MAX = 5
+_KEEP_ALIVE_TIMEOUT = 5
+
+# Maximale Body-Größe für WebServer-Requests in Bytes (größere werden mit 413 abgewiesen)
+MAX_BODY = 8192
 
 
+# ===================================================================
+# HILFSFUNKTIONEN
+# ===================================================================
+def _now_iso() -> str:
+    """
+    Gibt die aktuelle Systemzeit als ISO8601-UTC-String zurück.
 
+    :return: Zeitstempel wie "2025-08-28T10:00:00Z".
+    """
+    t = time.localtime()
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T"
+        f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}Z"
+    )
 
 
 # ===================================================================
@@ -71,6 +160,7 @@ class ConfigManager:
                 'MQTT_CLIENT_ID': os.getenv('MQTT_CLIENT_ID', 'pico_w_client'),
                 'telemetry_topic_temperature': os.getenv('telemetry_topic_temperature'),
                 'telemetry_topic_humidity': os.getenv('telemetry_topic_humidity'),
+                'telemetry_topic_combined': os.getenv('telemetry_topic_combined', ''),
                 'status_topic': os.getenv('status_topic'),
                 'reading_interval_seconds': int(os.getenv('reading_interval_seconds', '60')),
                 'sensor_pin': int(os.getenv('sensor_pin', '15'))
@@ -104,6 +194,16 @@ class ConfigManager:
         except Exception as e:
             print(f"Fehler beim Speichern der Konfiguration: {e}")
 
+    def update_settings(self, delta: dict):
+        """
+        Übernimmt geänderte Einstellungen in die geladene Konfiguration und
+        speichert sie (löst einen Neustart aus).
+
+        :param delta: Dictionary mit nur den geänderten Einstellungen.
+        """
+        self.settings.update(delta)
+        self.save_settings(self.settings)
+
 
 # ===================================================================
 # KLASSE: NetworkManager
@@ -123,7 +223,7 @@ class NetworkManager:
         self.ssid = ssid
         self.password = password
         self.max_retries = 5
-        self.retry_delay = 5
+        self.max_retry_delay = 30
 
     def connect(self) -> bool:
         """
@@ -142,8 +242,11 @@ class NetworkManager:
             except Exception as e:
                 print(f"Versuch {attempt + 1}/{self.max_retries} fehlgeschlagen: {e}")
                 if attempt < self.max_retries - 1:
-                    print(f"  Warte {self.retry_delay}s vor erneutem Versuch...")
-                    time.sleep(self.retry_delay)
+                    # Exponentielles Backoff mit Jitter, damit nicht alle Geräte
+                    # nach einem Ausfall gleichzeitig neu verbinden
+                    delay = min(self.max_retry_delay, 1 << attempt) + random.random() * 2
+                    print(f"  Warte {delay:.1f}s vor erneutem Versuch...")
+                    time.sleep(delay)
         
         print("WLAN-Verbindung nach allen Versuchen fehlgeschlagen!")
         return False
@@ -196,29 +299,101 @@ class Sensor:
     Kapselt die Logik zum Auslesen des DHT22-Sensors.
     """
 
+    # DHT11-Startsignal: mind. 18 ms low (PIO-Schleife mit 32 µs pro Durchlauf)
+    PIO_START_LOOPS = 20000 // 32
+    # Startsignal + Antwort + 40 Bits dauern ~25 ms
+    PIO_TIMEOUT_NS = 50_000_000
+    # Nach so vielen PIO-Fehlern in Folge wird auf adafruit_dht umgeschaltet
+    PIO_MAX_FAILURES = 5
+
     def __init__(self, pin_number: int):
         """
         Initialisiert den Sensor am angegebenen GPIO-Pin.
 
         :param pin_number: Die Nummer des GPIO-Pins (z.B. 15 für GP15).
         """
-        try:
-            # Dynamisch den Pin aus board-Modul holen
-            pin_name = f"GP{pin_number}"
-            self.pin = getattr(board, pin_name)
-            print(self.pin)
-            print(f"Pin {pin_name} gefunden")
-        except AttributeError:
+        self.pin = PICO_PINS.get(pin_number)
+        if self.pin is None:
             print(f"Pin GP{pin_number} existiert nicht, verwende GP22 als Fallback")
             self.pin = board.GP22
+        else:
+            print(f"Pin GP{pin_number} gefunden")
+        
+        self.sm = None
+        self.dht = None
+        self._pio_failures = 0
+        
+        # Bevorzugt PIO (Auslesen in Hardware), sonst adafruit_dht als Fallback
+        if rp2pio is None:
+            print("PIO nicht verfügbar (rp2pio/adafruit_pioasm fehlt), verwende adafruit_dht")
+        else:
+            try:
+                self.sm = rp2pio.StateMachine(
+                    DHT_PIO_PROGRAM,
+                    frequency=1_000_000,
+                    first_set_pin=self.pin,
+                    initial_set_pin_state=1,
+                    initial_set_pin_direction=0,
+                    first_in_pin=self.pin,
+                    pull_in_pin_up=1,
+                    auto_push=True,
+                    push_threshold=8,
+                    in_shift_right=False
+                )
+                self._pio_start = array.array("L", [self.PIO_START_LOOPS])
+                self._pio_buf = bytearray(5)
+                print(f"DHT11-Sensor (PIO) initialisiert an GP{pin_number}")
+                return
+            except Exception as e:
+                print(f"PIO nicht verfügbar ({e}), verwende adafruit_dht")
         
+        self._init_dht()
+
+    def _init_dht(self):
+        """
+        Initialisiert den Sensor über adafruit_dht (Fallback ohne PIO).
+        """
         try:
             self.dht = adafruit_dht.DHT11(self.pin)
-            print(f"DHT11-Sensor initialisiert an GP{pin_number}")
+            print(f"DHT11-Sensor initialisiert an {self.pin}")
         except Exception as e:
             print(f"Fehler bei Sensor-Initialisierung: {e}")
             self.dht = None
 
+    def _pio_read(self) -> tuple | None:
+        """
+        Liest den DHT11 über die PIO-State-Machine aus. Startsignal und
+        Bit-Abtastung laufen in Hardware, ein Lesevorgang dauert ~25 ms.
+
+        :return: Ein Tupel (temperatur, luftfeuchtigkeit) oder None bei
+                 Timeout bzw. falscher Checksumme.
+        """
+        sm = self.sm
+        sm.restart()
+        sm.clear_rxfifo()
+        sm.write(self._pio_start)
+        
+        # Bytes einzeln abholen, sobald sie anliegen: das RX-FIFO fasst nur
+        # 4 Wörter (TX wird für das Startsignal gebraucht), bei vollem FIFO
+        # würde die State Machine beim Autopush des 5. Bytes hängen bleiben
+        buf = self._pio_buf
+        i = 0
+        deadline = time.monotonic_ns() + self.PIO_TIMEOUT_NS
+        while i < 5:
+            if sm.in_waiting:
+                sm.readinto(buf, start=i, end=i + 1)
+                i += 1
+            elif time.monotonic_ns() > deadline:
+                return None
+        
+        if (buf[0] + buf[1] + buf[2] + buf[3]) & 0xFF != buf[4]:
+            return None
+        
+        humidity = buf[0] + buf[1] * 0.1
+        temperature = buf[2] + (buf[3] & 0x7F) * 0.1
+        if buf[3] & 0x80:
+            temperature = -temperature
+        return temperature, humidity
 
     def read_data(self) -> dict | None:
         """
@@ -227,6 +402,24 @@ class Sensor:
         :return: Ein Dictionary wie {'temperature': 22.5, 'humidity': 45.8}
                  oder None, falls das Auslesen fehlschlägt.
         """
+        if self.sm is not None:
+            result = self._pio_read()
+            if result is None:
+                print("Sensor-Warnung: PIO-Auslesen fehlgeschlagen (Timeout/Checksumme)")
+                self._pio_failures += 1
+                if self._pio_failures >= self.PIO_MAX_FAILURES:
+                    # PIO liefert dauerhaft nichts - auf adafruit_dht umschalten
+                    print(f"PIO {self._pio_failures}x fehlgeschlagen, verwende adafruit_dht")
+                    self.sm.deinit()
+                    self.sm = None
+                    self._init_dht()
+                return None
+            self._pio_failures = 0
+            return {
+                'temperature': float(result[0]),
+                'humidity': float(result[1])
+            }
+        
         if self.dht is None:
             return None
         
@@ -260,6 +453,15 @@ class MqttClient:
     Verwaltet die Kommunikation mit dem zentralen MQTT-Broker.
     """
 
+    # Kurzes Poll-Timeout, damit loop() die Hauptschleife nicht blockiert
+    LOOP_TIMEOUT = 0.05
+    # MiniMQTT nutzt socket_timeout auch für TCP-Connect und CONNACK - dafür
+    # reichen 50 ms über WLAN/WAN nicht, daher beim Verbinden länger warten
+    CONNECT_TIMEOUT = 1.0
+    # Maximaler Abstand zwischen zwei loop()-Aufrufen, auch wenn die
+    # Hauptschleife MQTT direkt nach HTTP-Requests überspringt
+    MAX_POLL_GAP = 1.0
+
     def __init__(self, config: dict):
         """
         Initialisiert den MQTT-Client mit den Broker-Details aus der Konfiguration.
@@ -278,18 +480,14 @@ class MqttClient:
             client_id=config['MQTT_CLIENT_ID'],
             socket_pool=self.pool,
             keep_alive=60,
+            socket_timeout=self.CONNECT_TIMEOUT,
             is_ssl=False
         )
-        iso_time_struct= time.localtime()
-        iso_time = (
-                    f"{iso_time_struct.tm_year:04d}-{iso_time_struct.tm_mon:02d}-{iso_time_struct.tm_mday:02d}T"
-                    f"{iso_time_struct.tm_hour:02d}:{iso_time_struct.tm_min:02d}:{iso_time_struct.tm_sec:02d}Z"
-                )
         last_will_topic = config['status_topic']
         last_will_payload ={
             "device_id": config['device_id'],
             "status": "offline",
-            "timestamp": iso_time
+            "timestamp": _now_iso()
         }
         self.mqtt.will_set(last_will_topic, json.dumps(last_will_payload), qos=1, retain=True)
 
@@ -304,7 +502,17 @@ class MqttClient:
         """
         try:
             print(f"Verbinde mit MQTT-Broker: {self.config['MQTT_BROKER']}:{self.config['MQTT_PORT']}")
-            self.mqtt.connect()
+            self.mqtt._socket_timeout = self.CONNECT_TIMEOUT
+            try:
+                self.mqtt.connect()
+            finally:
+                # MiniMQTT prüft in loop() timeout >= socket_timeout - daher auch
+                # bei fehlgeschlagenem Verbinden auf LOOP_TIMEOUT zurücksetzen
+                self.mqtt._socket_timeout = self.LOOP_TIMEOUT
+            # Der Socket wurde mit CONNECT_TIMEOUT angelegt - erst das Lese-Timeout
+            # des Sockets selbst lässt loop() auf einem leeren Socket nach
+            # LOOP_TIMEOUT statt nach einer Sekunde zurückkehren
+            self.mqtt._sock.settimeout(self.LOOP_TIMEOUT)
             print("MQTT verbunden!")
             return True
         except Exception as e:
@@ -313,69 +521,73 @@ class MqttClient:
         
         
 
-    def publish_telemetry(self, data: dict):
+    def publish_telemetry(self, data: dict, ts: str = None):
         """
         Formatiert die Sensordaten in ein JSON-Payload und sendet sie
         an das definierte Telemetrie-Topic.
 
         :param data: Das Dictionary mit den Sensordaten.
+        :param ts: ISO8601-Zeitstempel der Messung (Standard: aktuelle Zeit).
         """
         try:
             # ISO8601 UTC Timestamp
+            if ts is None:
+                ts = _now_iso()
+            did = self.config['device_id']
             
-            iso_time_struct= time.localtime()
-            iso_time = (
-                        f"{iso_time_struct.tm_year:04d}-{iso_time_struct.tm_mon:02d}-{iso_time_struct.tm_mday:02d}T"
-                        f"{iso_time_struct.tm_hour:02d}:{iso_time_struct.tm_min:02d}:{iso_time_struct.tm_sec:02d}Z"
-                    )
-            # Temperatur-Payload
-            temp_payload = {
-                "device_id": self.config['device_id'],
-                "unit": "°C",
-                "value": data['temperature'],
-                "timestamp": iso_time
-            }
-            
-            # Luftfeuchtigkeit-Payload
-            humidity_payload = {
-                "device_id": self.config['device_id'],
-                "unit": "%",
-                "value": data['humidity'],
-                "timestamp": iso_time
-            }
+            # Payloads mit festem Schema direkt als String formatieren
+            # (deutlich schneller als json.dumps auf dem Pico)
+            combined_topic = self.config.get('telemetry_topic_combined')
             
-            # Topics
-            temp_topic = self.config['telemetry_topic_temperature']
-            humidity_topic = self.config['telemetry_topic_humidity']
-            
-            # Senden
-            self.mqtt.publish(temp_topic, json.dumps(temp_payload), qos=1)
-            self.mqtt.publish(humidity_topic, json.dumps(humidity_payload), qos=1)
+            if combined_topic:
+                # Kombinierter Payload: ein Publish (und ein PUBACK) pro Messzyklus
+                combined_payload = (
+                    f'{{"device_id":"{did}","temperature":{data["temperature"]},'
+                    f'"humidity":{data["humidity"]},"timestamp":"{ts}"}}'
+                )
+                self.mqtt.publish(combined_topic, combined_payload, qos=1)
+            else:
+                # Temperatur-Payload
+                temp_payload = (
+                    f'{{"device_id":"{did}","unit":"°C",'
+                    f'"value":{data["temperature"]},"timestamp":"{ts}"}}'
+                )
+                
+                # Luftfeuchtigkeit-Payload
+                humidity_payload = (
+                    f'{{"device_id":"{did}","unit":"%",'
+                    f'"value":{data["humidity"]},"timestamp":"{ts}"}}'
+                )
+                
+                # Topics
+                temp_topic = self.config['telemetry_topic_temperature']
+                humidity_topic = self.config['telemetry_topic_humidity']
+                
+                # Senden
+                self.mqtt.publish(temp_topic, temp_payload, qos=1)
+                self.mqtt.publish(humidity_topic, humidity_payload, qos=1)
             
             print(f"Telemetrie gesendet: T={data['temperature']:.1f}°C, H={data['humidity']:.1f}%")
             
         except Exception as e:
             print(f"Fehler beim Senden der Telemetrie: {e}")
 
-    def publish_status(self, status: str):
+    def publish_status(self, status: str, ts: str = None):
         """
         Sendet eine einfache Statusnachricht (z.B. "online", "rebooting")
         an das definierte Status-Topic.
 
         :param status: Die zu sendende Statusnachricht.
+        :param ts: ISO8601-Zeitstempel (Standard: aktuelle Zeit).
         """
-        iso_time_struct= time.localtime()
-        iso_time = (
-                    f"{iso_time_struct.tm_year:04d}-{iso_time_struct.tm_mon:02d}-{iso_time_struct.tm_mday:02d}T"
-                    f"{iso_time_struct.tm_hour:02d}:{iso_time_struct.tm_min:02d}:{iso_time_struct.tm_sec:02d}Z"
-                )
-        status_payload = {
-            "device_id": self.config['device_id'],
-            "status": status,
-            "timestamp": iso_time
-            }
+        if ts is None:
+            ts = _now_iso()
+        status_payload = (
+            f'{{"device_id":"{self.config["device_id"]}","status":"{status}",'
+            f'"timestamp":"{ts}"}}'
+        )
         try:
-            self.mqtt.publish(self.config['status_topic'], json.dumps(status_payload), qos=1, retain=True)
+            self.mqtt.publish(self.config['status_topic'], status_payload, qos=1, retain=True)
             print(f"Status gesendet: {status}")
         except Exception as e:
             print(f"Fehler beim Senden des Status: {e}")
@@ -383,10 +595,10 @@ class MqttClient:
     def loop(self):
         """
         Hält die MQTT-Verbindung aktiv. Muss regelmäßig in der Hauptschleife
-        aufgerufen werden.
+        aufgerufen werden (kehrt nach spätestens LOOP_TIMEOUT Sekunden zurück).
         """
         try:
-            self.mqtt.loop(timeout=1)
+            self.mqtt.loop(timeout=self.LOOP_TIMEOUT)
         except Exception as e:
             print(f"MQTT Loop-Fehler: {e}")
 
@@ -405,6 +617,19 @@ class WebServer:
       - GET /status       - Gerätestatus abrufen
     """
 
+    # Erlaubte Schlüssel für POST /config und Mapping auf interne Schlüssel
+    _VALID_KEYS = frozenset({
+        "device_id", "names", "location",
+        "mqtt_broker", "mqtt_port", "mqtt_user", "mqtt_password",
+        "reading_interval_seconds", "sensor_pin"
+    })
+    _KEY_MAPPING = {
+        "mqtt_broker": "MQTT_BROKER",
+        "mqtt_port": "MQTT_PORT",
+        "mqtt_user": "MQTT_USER",
+        "mqtt_password": "MQTT_PASSWORD"
+    }
+
     def __init__(self, config_manager, mqtt_client=None, sensor=None, network_manager=None, port=80):
         """
         Initialisiert den WebServer.
@@ -424,13 +649,45 @@ class WebServer:
         self.pool = socketpool.SocketPool(wifi.radio)
         self.server_socket = None
         self.last_sensor_data = None  # Speichert letzte erfolgreiche Messung
+        self._config_response_cache = None  # Fertige GET /config-Antwort (bytes)
+        
+        # Gecachte GET /status-Antwort; nur uptime_seconds wird pro Request gepatcht
+        self._status_cache = None
+        self._status_uptime_pos = 0
+        self._status_state = None  # (wifi_connected, mqtt_connected) beim Aufbau des Caches
+        self._status_dirty = True
+        
+        # Empfangspuffer einmal allozieren und für alle Requests wiederverwenden
+        self._recv_buf = bytearray(4096)
+        self._recv_mv = memoryview(self._recv_buf)
+        
+        # Offen gehaltene Keep-Alive-Verbindungen: (Socket, letzte Aktivität, Anzahl Requests)
+        self._active_clients = []
+        
+        # Routing-Tabellen (Pfad -> Handler)
+        self._get_routes = {
+            "/config": self._get_config,
+            "/status": self._get_status
+        }
+        self._post_routes = {
+            "/config": self._post_config
+        }
+        
+        # Konstante Fehlerantworten einmalig vorberechnen (nur dynamische
+        # Fehlermeldungen laufen über _http_error)
+        self._err_400 = self._http_error(400, "Bad Request")
+        self._err_404 = self._http_error(404, "Not Found")
+        self._err_405 = self._http_error(405, "Method Not Allowed", {"Allow": "GET, POST"})
+        self._err_413 = self._http_error(413, "Payload Too Large")
+        self._err_431 = self._http_error(431, "Request Header Fields Too Large")
+        self._err_500 = self._http_error(500, "Internal Server Error")
 
     # -------------------------------------------------------------------
     def start(self):
         """Startet den Webserver (non-blocking)."""
         try:
             self.server_socket = self.pool.socket(self.pool.AF_INET, self.pool.SOCK_STREAM)
-            self.server_socket.settimeout(0.1)  # Kurzes Timeout für non-blocking
+            self.server_socket.settimeout(0.0)  # Non-blocking: leeres accept() wirft OSError
             self.server_socket.setsockopt(self.pool.SOL_SOCKET, self.pool.SO_REUSEADDR, 1)
             self.server_socket.bind(("0.0.0.0", self.port))
             self.server_socket.listen(2)
@@ -447,71 +704,175 @@ class WebServer:
         """
         Prüft auf eingehende HTTP-Anfragen (nicht blockierend).
         Sollte regelmäßig in der Hauptschleife aufgerufen werden.
+        
+        Offen gehaltene Keep-Alive-Verbindungen werden zuerst auf weitere
+        Requests geprüft, danach wird ein neuer Client angenommen.
+        
+        :return: True wenn in diesem Aufruf ein Request bedient wurde, sonst False
         """
         if not self.server_socket:
-            return
+            return False
+
+        handled = False
+
+        # Keep-Alive-Verbindungen ohne erneuten TCP-Handshake bedienen
+        if self._active_clients:
+            now = time.monotonic()
+            for entry in list(self._active_clients):
+                client, last_seen, served = entry
+                allow = served + 1 < _KEEP_ALIVE_MAX
+                keep = self._serve_client(client, 0.0, allow)
+                if keep is None:
+                    # Noch keine neuen Daten - nach Leerlauf-Timeout schließen
+                    if now - last_seen < _KEEP_ALIVE_TIMEOUT:
+                        continue
+                    keep = False
+                else:
+                    handled = True
+                self._active_clients.remove(entry)
+                if keep:
+                    self._active_clients.append((client, now, served + 1))
+                else:
+                    self._close_client(client)
 
         try:
             client, addr = self.server_socket.accept()
         except OSError:
             # Kein Client wartet - normal bei non-blocking
-            return
+            return handled
+
+        # Nagle deaktivieren, damit kleine Antworten sofort rausgehen
+        # (nicht jede CircuitPython-Version stellt TCP_NODELAY bereit)
+        try:
+            client.setsockopt(self.pool.IPPROTO_TCP, self.pool.TCP_NODELAY, 1)
+        except (AttributeError, OSError):
+            pass
+
+        if DEBUG:
+            print(f"\n→ HTTP-Anfrage von {addr[0]}:{addr[1]}")
 
-        print(f"\n→ HTTP-Anfrage von {addr[0]}:{addr[1]}")
+        # Keep-Alive nur anbieten, solange Plätze frei sind (Backlog von listen(2))
+        allow = len(self._active_clients) < _MAX_ACTIVE_CLIENTS
+        if self._serve_client(client, 2.0, allow):
+            self._active_clients.append((client, time.monotonic(), 1))
+        else:
+            self._close_client(client)
+        return True
 
+    # -------------------------------------------------------------------
+    def _serve_client(self, client, timeout, allow_keep_alive):
+        """
+        Liest einen Request vom Client, verarbeitet ihn und sendet die Antwort.
+        
+        :param client: Verbundener Client-Socket
+        :param timeout: Timeout für das erste recv (0.0 = nicht blockierend)
+        :param allow_keep_alive: Ob die Verbindung offen gehalten werden darf
+        :return: True wenn die Verbindung offen bleibt, False wenn sie zu
+                 schließen ist, None wenn (noch) keine Daten anlagen
+        """
         try:
-            # HTTP-Request empfangen (max 4KB)
-            request = b""
-            client.settimeout(2.0)
+            # HTTP-Request in den persistenten Puffer empfangen (max 4KB),
+            # komplett auf Bytes arbeiten
+            client.settimeout(timeout)
 
-            buf = bytearray(512)
+            recv_mv = self._recv_mv
+            total = 0
+            header_end = -1
+            peer_closed = False
 
-            while len(request) < 4096:
+            while total < len(self._recv_buf):
                 try:
-                    n = client.recv_into(buf)
-                    print(f"  Empfange {n} Bytes,")
-                    if n == 0:
-                        break
-                    request += buf[:n]
-
-                    if b"\r\n\r\n" in request:
-                        break
+                    n = client.recv_into(recv_mv[total:])
                 except OSError:
                     break
+                if DEBUG:
+                    print(f"  Empfange {n} Bytes,")
+                if n == 0:
+                    peer_closed = True
+                    break
+                if total == 0:
+                    # Erster Teil ist da - Rest des Requests blockierend lesen
+                    client.settimeout(2.0)
+                # Nur im neu empfangenen Bereich (plus 3 Bytes Überlappung) suchen
+                search_start = max(0, total - 3)
+                total += n
+
+                pos = bytes(recv_mv[search_start:total]).find(b"\r\n\r\n")
+                if pos != -1:
+                    header_end = search_start + pos
+                    break
 
-            if not request:
-                client.close()
-                return
+            if total == 0:
+                return False if peer_closed or timeout else None
 
-            request_str = request.decode("utf-8")
+            # Puffer voll ohne Header-Ende: Header zu groß, Verbindung sofort beenden
+            if header_end == -1 and total >= len(self._recv_buf):
+                self._sendall(client, self._err_431)
+                return False
 
-            # Request-Line parsen
-            lines = request_str.split("\r\n")
-            request_line = lines[0]
-            parts = request_line.split()
+            # Header-Ende bestimmen (ohne Leerzeile gibt es keinen Body)
+            if header_end == -1:
+                header_end = total
+                body_start = total
+            else:
+                body_start = header_end + 4
 
-            if len(parts) < 2:
-                response = self._http_error(400, "Bad Request")
-                client.send(response)
-                return
+            head = bytes(recv_mv[:header_end])
 
-            method, path = parts[0], parts[1]
-            print(f"  {method} {path}")
+            # Request-Line parsen: Methode und Pfad per find() statt split() lokalisieren
+            rl_end = head.find(_CRLF)
+            if rl_end == -1:
+                rl_end = len(head)
+            sp1 = head.find(b" ", 0, rl_end)
 
-            # Header-Teil extrahieren und Body korrekt lesen
-            header_end = request_str.find("\r\n\r\n")
-            headers = request_str[:header_end].split("\r\n")[1:]  
-            body = request_str[header_end + 4:] if header_end != -1 else ""
-            # Content-Length prüfen
-            content_length = 0
-            for header in headers:
-                if header.lower().startswith("content-length:"):
-                    content_length = int(header.split(":")[1].strip())
-                    break
+            if sp1 <= 0:
+                response = self._err_400
+                self._sendall(client, response)
+                return False
+
+            sp2 = head.find(b" ", sp1 + 1, rl_end)
+            if sp2 == -1:
+                sp2 = rl_end
 
-            # Body vervollständigen, falls noch nicht vollständig gelesen
-            while len(body.encode("utf-8")) < content_length:
-                body += client.recv(512).decode("utf-8")
+            method = head[:sp1].decode("utf-8")
+            path = head[sp1 + 1:sp2].decode("utf-8")
+            if DEBUG:
+                print(f"  {method} {path}")
+
+            # Content-Length im kleingeschriebenen Header-Block suchen
+            content_length = 0
+            header_block = head.lower()
+            idx = header_block.find(_CL_HEADER)
+            if idx != -1:
+                value_start = idx + len(_CL_HEADER)
+                line_end = header_block.find(_CRLF, value_start)
+                if line_end == -1:
+                    line_end = len(header_block)
+                content_length = int(header_block[value_start:line_end].strip())
+
+            # Übergroße Bodies gar nicht erst lesen, Verbindung sofort beenden
+            if content_length > MAX_BODY:
+                self._sendall(client, self._err_413)
+                return False
+
+            # Body bleibt bytes - json.loads verarbeitet bytes direkt
+            have = min(total - body_start, content_length)
+            if have == content_length:
+                # Body liegt bereits komplett im Empfangspuffer - kein weiteres recv
+                body = bytes(recv_mv[body_start:body_start + have])
+            else:
+                # Rest in einen vorab allozierten Puffer lesen, pro recv_into
+                # genau die noch fehlende Anzahl Bytes anfordern
+                body_buf = bytearray(content_length)
+                body_buf[:have] = recv_mv[body_start:body_start + have]
+                body_mv = memoryview(body_buf)
+                while have < content_length:
+                    remaining = content_length - have
+                    n = client.recv_into(body_mv[have:have + remaining], remaining)
+                    if not n:
+                        break
+                    have += n
+                body = bytes(body_mv[:have])
 
             # Request verarbeiten
             if method == "GET":
@@ -519,25 +880,58 @@ class WebServer:
             elif method == "POST":
                 response = self._handle_post_request(path, body)
             else:
-                response = self._http_error(405, "Method Not Allowed",
-                                            {"Allow": "GET, POST"})
+                response = self._err_405
 
-            client.send(response)
-            print(f"← {method} {path} - Antwort gesendet")
+            # Keep-Alive nur für idempotente GETs unter HTTP/1.1 ohne "Connection: close"
+            keep_alive = (allow_keep_alive
+                          and method == "GET"
+                          and head.find(b"HTTP/1.1", sp2 + 1, rl_end) != -1
+                          and header_block.find(_CONN_CLOSE_HEADER) == -1)
+            if keep_alive:
+                response = response.replace(_CONN_CLOSE, _CONN_KEEP_ALIVE, 1)
+
+            self._sendall(client, response)
+            if DEBUG:
+                print(f"← {method} {path} - Antwort gesendet")
+            return keep_alive
 
         except Exception as e:
             print(f"✗ WebServer-Fehler: {e}")
             try:
-                response = self._http_error(500, "Internal Server Error")
-                client.send(response)
+                response = self._err_500
+                self._sendall(client, response)
             except:
                 pass
+            return False
 
-        finally:
-            try:
-                client.close()
-            except:
-                pass
+    # -------------------------------------------------------------------
+    def _sendall(self, client, data):
+        """
+        Sendet die komplette Antwort, auch wenn send() nur teilweise schreibt.
+        
+        :param client: Verbundener Client-Socket
+        :param data: Zu sendende Daten als bytes
+        """
+        mv = memoryview(data)
+        sent = 0
+        total = len(mv)
+        while sent < total:
+            n = client.send(mv[sent:])
+            if not n:
+                break
+            sent += n
+
+    # -------------------------------------------------------------------
+    def _close_client(self, client):
+        """
+        Schließt einen Client-Socket und ignoriert dabei auftretende Fehler.
+        
+        :param client: Zu schließender Client-Socket
+        """
+        try:
+            client.close()
+        except:
+            pass
 
     # -------------------------------------------------------------------
     def _handle_get_request(self, path):
@@ -547,13 +941,8 @@ class WebServer:
         :param path: Request-Pfad
         :return: HTTP-Response als bytes
         """
-        print(f"→ GET-Anfrage für {path}")
-        if path == "/config":
-            return self._get_config()
-        elif path == "/status":
-            return self._get_status()
-        else:
-            return self._http_error(404, "Not Found")
+        handler = self._get_routes.get(path)
+        return handler() if handler else self._err_404
 
     # -------------------------------------------------------------------
     def _handle_post_request(self, path, body):
@@ -561,14 +950,11 @@ class WebServer:
         Bearbeitet POST-Anfragen gemäß OpenAPI-Spezifikation.
         
         :param path: Request-Pfad
-        :param body: Request-Body
+        :param body: Request-Body als bytes
         :return: HTTP-Response als bytes
         """
-        print(f"→ post-Anfrage für {path}")
-        if path == "/config":
-            return self._post_config(body)
-        else:
-            return self._http_error(404, "Not Found")
+        handler = self._post_routes.get(path)
+        return handler(body) if handler else self._err_404
 
     # -------------------------------------------------------------------
     def _get_config(self):
@@ -587,7 +973,12 @@ class WebServer:
             "sensor_pin": integer
         }
         """
-        print("→ GET /config angefordert")
+        if DEBUG:
+            print("→ GET /config angefordert")
+        # Konfiguration ändert sich nur per POST /config (mit Neustart)
+        if self._config_response_cache is not None:
+            return self._config_response_cache
+        
         try:
             config = {
                 "device_id": self.config_manager.settings.get("device_id", ""),
@@ -600,14 +991,16 @@ class WebServer:
                 "sensor_pin": self.config_manager.settings.get("sensor_pin", 15)
             }
             
-            return self._http_response(200, json.dumps(config), "application/json")
+            response = self._http_response(200, json.dumps(config), "application/json")
+            self._config_response_cache = response
+            return response
             
         except Exception as e:
             print(f"✗ Fehler bei GET /config: {e}")
-            return self._http_error(500, "Internal Server Error")
+            return self._err_500
 
     # -------------------------------------------------------------------
-    def _post_config(self, body):
+    def _post_config(self, body_bytes):
         """
         POST /config - Aktualisiert Konfiguration.
         
@@ -625,26 +1018,23 @@ class WebServer:
         }
         
         Response: 200 OK mit Bestätigung und Neustart-Hinweis
+        
+        :param body_bytes: Request-Body als bytes (ohne vorheriges Dekodieren)
         """
-        print("→ POST /config angefordert")
+        if DEBUG:
+            print("→ POST /config angefordert")
         try:
-            if not body or not body.strip():
+            if len(body_bytes) == 0 or body_bytes.isspace():
                 return self._http_error(400, "Empty request body")
             
             # JSON parsen
             try:
-                new_config = json.loads(body)
+                new_config = json.loads(body_bytes)
             except ValueError as e:
                 return self._http_error(400, f"Invalid JSON: {str(e)}")
             
             # Validierung
-            valid_keys = {
-                "device_id", "names", "location", 
-                "mqtt_broker", "mqtt_port", "mqtt_user", "mqtt_password",
-                "reading_interval_seconds", "sensor_pin"
-            }
-            
-            invalid_keys = set(new_config.keys()) - valid_keys
+            invalid_keys = [key for key in new_config if key not in self._VALID_KEYS]
             if invalid_keys:
                 return self._http_error(400, f"Invalid configuration keys: {', '.join(invalid_keys)}")
             
@@ -662,17 +1052,10 @@ class WebServer:
                     return self._http_error(400, "sensor_pin must be integer between 0-28")
             
             # Konfiguration aktualisieren und speichern
-            # Mapping zu internen Schlüsseln
-            key_mapping = {
-                "mqtt_broker": "MQTT_BROKER",
-                "mqtt_port": "MQTT_PORT",
-                "mqtt_user": "MQTT_USER",
-                "mqtt_password": "MQTT_PASSWORD"
-            }
-            
-            updated_settings = self.config_manager.settings.copy()
+            # Nur die geänderten Schlüssel sammeln (keine Kopie der gesamten Konfiguration)
+            updated_settings = {}
             for key, value in new_config.items():
-                internal_key = key_mapping.get(key, key)
+                internal_key = self._KEY_MAPPING.get(key, key)
                 updated_settings[internal_key] = value
             
             # Erfolgsantwort senden BEVOR Neustart
@@ -684,10 +1067,13 @@ class WebServer:
             response = self._http_response(200, json.dumps(response_data), "application/json")
             
             # Antwort senden
-            print("  Sende Bestätigung und bereite Neustart vor...")
+            if DEBUG:
+                print("  Sende Bestätigung und bereite Neustart vor...")
             
             # Konfiguration speichern (löst Neustart aus)
-            self.config_manager.save_settings(updated_settings)
+            self._config_response_cache = None
+            self._status_dirty = True
+            self.config_manager.update_settings(updated_settings)
             
             return response
             
@@ -715,21 +1101,9 @@ class WebServer:
             "firmware_version": "string"
         }
         """
-        print("→ GET /status angefordert")
+        if DEBUG:
+            print("→ GET /status angefordert")
         try:
-            # Aktuellen Sensor-Wert holen (falls verfügbar)
-            current_temp = None
-            current_humidity = None
-            
-            if self.last_sensor_data:
-                current_temp = self.last_sensor_data.get('temperature')
-                current_humidity = self.last_sensor_data.get('humidity')
-            
-            # Timestamp der letzten Messung
-            last_reading_time = None
-            if self.last_sensor_data and 'timestamp' in self.last_sensor_data:
-                last_reading_time = self.last_sensor_data['timestamp']
-            
             # MQTT-Status
             mqtt_connected = False
             try:
@@ -738,45 +1112,94 @@ class WebServer:
             except:
                 pass
             
-            status = {
-                "device_id": self.config_manager.settings.get("device_id", "unknown"),
-                "wifi_connected": wifi.radio.connected,
-                "wifi_ssid": self.config_manager.settings.get("CIRCUITPY_WIFI_SSID", ""),
-                "ip_address": str(wifi.radio.ipv4_address) if wifi.radio.connected else None,
-                "mqtt_connected": mqtt_connected,
-                "mqtt_broker": self.config_manager.settings.get("MQTT_BROKER", ""),
-                "uptime_seconds": int(time.monotonic() - self.start_time),
-                "last_temperature": current_temp,
-                "last_humidity": current_humidity,
-                "last_reading_timestamp": last_reading_time,
-                "firmware_version": "1.0.0"
-            }
+            # Cache neu aufbauen, wenn Daten geändert oder Verbindungszustand gewechselt
+            state = (wifi.radio.connected, mqtt_connected)
+            if self._status_dirty or state != self._status_state:
+                self._build_status_cache(state)
+            
+            # Uptime in fester Breite direkt in die gecachte Antwort schreiben
+            digits = str(int(time.monotonic() - self.start_time)).encode()
+            pos = self._status_uptime_pos
+            self._status_cache[pos:pos + _UPTIME_WIDTH] = digits + b" " * (_UPTIME_WIDTH - len(digits))
             
-            return self._http_response(200, json.dumps(status), "application/json")
+            return bytes(self._status_cache)
             
         except Exception as e:
             print(f"✗ Fehler bei GET /status: {e}")
-            return self._http_error(500, "Internal Server Error")
+            return self._err_500
 
     # -------------------------------------------------------------------
-    def update_sensor_data(self, sensor_data):
+    def _build_status_cache(self, state):
+        """
+        Serialisiert alle /status-Felder außer uptime_seconds und legt die
+        fertige HTTP-Antwort mit Uptime-Platzhalter im Cache ab.
+        
+        :param state: Tupel (wifi_connected, mqtt_connected)
+        """
+        wifi_connected, mqtt_connected = state
+        
+        # Aktuellen Sensor-Wert holen (falls verfügbar)
+        current_temp = None
+        current_humidity = None
+        
+        if self.last_sensor_data:
+            current_temp = self.last_sensor_data.get('temperature')
+            current_humidity = self.last_sensor_data.get('humidity')
+        
+        # Timestamp der letzten Messung
+        last_reading_time = None
+        if self.last_sensor_data and 'timestamp' in self.last_sensor_data:
+            last_reading_time = self.last_sensor_data['timestamp']
+        
+        status = {
+            "device_id": self.config_manager.settings.get("device_id", "unknown"),
+            "wifi_connected": wifi_connected,
+            "wifi_ssid": self.config_manager.settings.get("CIRCUITPY_WIFI_SSID", ""),
+            "ip_address": str(wifi.radio.ipv4_address) if wifi_connected else None,
+            "mqtt_connected": mqtt_connected,
+            "mqtt_broker": self.config_manager.settings.get("MQTT_BROKER", ""),
+            "last_temperature": current_temp,
+            "last_humidity": current_humidity,
+            "last_reading_timestamp": last_reading_time,
+            "firmware_version": "1.0.0"
+        }
+        
+        # uptime_seconds als erstes Feld mit fester Breite voranstellen
+        body = _UPTIME_PREFIX + b" " * _UPTIME_WIDTH + b"," + json.dumps(status).encode("utf-8")[1:]
+        response = self._http_response(200, body, "application/json")
+        
+        self._status_cache = bytearray(response)
+        self._status_uptime_pos = len(response) - len(body) + len(_UPTIME_PREFIX)
+        self._status_state = state
+        self._status_dirty = False
+
+    # -------------------------------------------------------------------
+    def update_sensor_data(self, sensor_data, ts=None):
         """
         Aktualisiert die gespeicherten Sensordaten mit Timestamp.
         Sollte nach jeder erfolgreichen Messung aufgerufen werden.
         
         :param sensor_data: Dictionary mit temperature und humidity
+        :param ts: ISO8601-Zeitstempel der Messung (Standard: aktuelle Zeit)
         """
         if sensor_data:
-            timestamp = time.localtime()
-            iso_time = "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}Z".format(
-                timestamp[0], timestamp[1], timestamp[2],
-                timestamp[3], timestamp[4], timestamp[5]
-            )
+            # Zeitstempel der Messung übernehmen (kein zweites localtime())
+            if ts is None:
+                ts = _now_iso()
             self.last_sensor_data = {
                 'temperature': sensor_data.get('temperature'),
                 'humidity': sensor_data.get('humidity'),
-                'timestamp': iso_time
+                'timestamp': ts
             }
+            self._status_dirty = True
+
+    # -------------------------------------------------------------------
+    def invalidate_status(self):
+        """
+        Markiert die gecachte /status-Antwort als veraltet
+        (z. B. nach WLAN- oder MQTT-Reconnect).
+        """
+        self._status_dirty = True
 
     # -------------------------------------------------------------------
     def _http_response(self, status_code, body, content_type="text/plain", extra_headers=None):
@@ -784,36 +1207,38 @@ class WebServer:
         Erzeugt eine HTTP-Response.
         
         :param status_code: HTTP-Statuscode
-        :param body: Response-Body (String)
+        :param body: Response-Body (String oder bytes)
         :param content_type: Content-Type Header
         :param extra_headers: Dictionary mit zusätzlichen Headern
         :return: Response als bytes
         """
-        status_messages = {
-            200: "OK",
-            400: "Bad Request",
-            404: "Not Found",
-            405: "Method Not Allowed",
-            500: "Internal Server Error"
-        }
+        status_line = _STATUS_LINES.get(status_code)
+        if status_line is None:
+            status_line = f"HTTP/1.1 {status_code} Unknown\r\n".encode("utf-8")
         
-        reason = status_messages.get(status_code, "Unknown")
+        ct_line = _CONTENT_TYPES.get(content_type)
+        if ct_line is None:
+            ct_line = f"Content-Type: {content_type}\r\n".encode("utf-8")
         
-        headers = (
-            f"HTTP/1.1 {status_code} {reason}\r\n"
-            f"Content-Type: {content_type}\r\n"
-            f"Content-Length: {len(body)}\r\n"
-            f"Connection: close\r\n"
-            f"Server: Pico-W/CircuitPython\r\n"
-        )
+        # Body einmal kodieren, Content-Length in Bytes
+        body_b = body.encode("utf-8") if isinstance(body, str) else body
+        
+        parts = [
+            status_line,
+            ct_line,
+            _CONTENT_LENGTH, str(len(body_b)).encode("utf-8"), _CRLF,
+            _CONN_CLOSE,
+            _SERVER_LINE
+        ]
         
         if extra_headers:
             for key, value in extra_headers.items():
-                headers += f"{key}: {value}\r\n"
+                parts.append(f"{key}: {value}\r\n".encode("utf-8"))
         
-        headers += "\r\n"
+        parts.append(_CRLF)
+        parts.append(body_b)
         
-        return (headers + body).encode("utf-8")
+        return b"".join(parts)
 
     # -------------------------------------------------------------------
     def _http_error(self, status_code, message, extra_headers=None):
@@ -918,39 +1343,54 @@ def main():
 
     led.value = True
     
-    # Timer für Sende-Intervall
-    last_reading_time = time.monotonic()
+    # Timer für Sende-Intervall (Deadline statt blockierendem Warten)
     reading_interval = config['reading_interval_seconds']
+    next_read = time.monotonic() + reading_interval
+    
+    # Leerlauf-Zähler für adaptive Pause (0 direkt nach einem bedienten Request)
+    idle_iters = 0
+    last_mqtt_poll = time.monotonic()
     
     # 6. HAUPTSCHLEIFE
     print("Starte Hauptschleife...\n")
     
     while True:
         try:
-            # MQTT-Verbindung aufrechterhalten
-            if mqtt_client:
+            # MQTT-Verbindung aufrechterhalten. loop() blockiert bis zu
+            # LOOP_TIMEOUT - direkt nach einem bedienten Request wird es
+            # übersprungen, spätestens nach MAX_POLL_GAP aber trotzdem aufgerufen
+            now = time.monotonic()
+            if mqtt_client and (idle_iters or now - last_mqtt_poll >= mqtt_client.MAX_POLL_GAP):
                 mqtt_client.loop()
+                last_mqtt_poll = now
             
             # WebServer-Anfragen prüfen (WICHTIG: Regelmäßig aufrufen!)
-            web_server.poll()
+            if web_server.poll():
+                idle_iters = 0
+            else:
+                idle_iters += 1
             
             # Prüfen, ob Lese-Intervall abgelaufen ist
             current_time = time.monotonic()
-            if current_time - last_reading_time >= reading_interval:
-                last_reading_time = current_time
+            if current_time >= next_read:
+                next_read += reading_interval
+                if next_read <= current_time:
+                    # Zu weit zurück (z.B. nach WLAN-Reconnect) - nicht nachholen
+                    next_read = current_time + reading_interval
                 
                 led.value = False
                 
                 print(f"[{int(time.monotonic())}s] Lese Sensordaten...")
                 sensor_data = sensor.read_data()
+                ts = _now_iso()
                 
                 if sensor_data:
                     # Sensordaten im WebServer aktualisieren
-                    web_server.update_sensor_data(sensor_data)
+                    web_server.update_sensor_data(sensor_data, ts)
                     
                     # MQTT-Telemetrie senden (falls verbunden)
                     if mqtt_client:
-                        mqtt_client.publish_telemetry(sensor_data)
+                        mqtt_client.publish_telemetry(sensor_data, ts)
                     
                     led.value = True
                 else:
@@ -969,10 +1409,15 @@ def main():
                     if mqtt_client:
                         mqtt_client.connect()
                         mqtt_client.publish_status("reconnected")
+                    web_server.invalidate_status()
                     led.value = True
             
-            # Kurze Pause (wichtig für WebServer-Reaktionszeit!)
-            time.sleep(0.1)
+            # Adaptive Pause: nach einem Request sofort weiter, im Leerlauf
+            # schrittweise länger (max. 0.1s), damit MQTT und WebServer
+            # regelmäßig bedient werden
+            sleep_s = min(0.1, 0.001 * idle_iters)
+            if sleep_s:
+                time.sleep(sleep_s)
             
         except KeyboardInterrupt:
             print("\n\nProgramm durch Benutzer beendet.")